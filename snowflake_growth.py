@@ -7,8 +7,10 @@ Simulates the growth of a snowflake and displays it in real-time
 """
 
 from PIL import Image, ImageDraw
-from copy import copy, deepcopy
-import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from numba import njit, prange, void, boolean, float32, int32, intp
+import numpy as np
 import os
 import argparse
 import imageio
@@ -33,13 +35,19 @@ SIGMA = 0.000 # Coefficient for the interference
 DIMENSION = [300,300] # The dimension of the plate (number of rows and columns) (Odd numbers are prefered, because then, there is only one middle cell)
 FREQUENCY = 20 # The frequency at which the program saves the state
 
-DEFAULT_CELL = {"is_in_crystal":False, "b":0, "c":0, "d":RHO}
 # b == proportion of quasi-liquid water
 # c == proportion of ice
 # d == quantity of steam
 
 # NOTE : The dimension is in the form (rows, columns) And so are the coordinates
 
+# Relative coordinates of the neighbours of a cell, which depend on the parity of its row (see `generate_neighbours`)
+OFFSETS_EVEN = np.array([(0,-1), (-1,-1), (-1,0), (0,1), (1,0), (1,-1)], dtype=np.int8)
+OFFSETS_ODD = np.array([(0,-1), (-1,0), (-1,1), (0,1), (1,1), (1,0)], dtype=np.int8)
+
+_RNG = np.random.default_rng() # Random generator of the interference phase
+_IMG_POOL = ThreadPoolExecutor(max_workers=1) # Thread in which the states of the plate are saved
+
 # Setup functions
 
 parser = argparse.ArgumentParser(description='Allow the user to generate a snowflake.',formatter_class=argparse.ArgumentDefaultsHelpFormatter)
@@ -69,7 +77,7 @@ parser.add_argument('-s', '-sigma', type=float,
                     help='The Sigma value, corresponds to the interference.', default=SIGMA)
 
 parser.add_argument('-app', '-approximation', type=int,
-                    help='The Approximation value, the range which represents the distance from the initial cell where the calculous are made. (Below 20 is deprecated)', default=APPROXIMATION)
+                    help='The Approximation value, the range which represents the distance from the crystal where the calculous are made, 0 for the whole plate. (Below 20 is deprecated)', default=APPROXIMATION)
 
 parser.add_argument('-n','-number', type=int,
                     help='The Number of iterations.', default=NUMBER)
@@ -80,58 +88,65 @@ parser.add_argument('-d', '-dimension', type=int,
 parser.add_argument('-f', '-frequency', type=int,
                     help='The Frequency value, every time we pass the number of frames corresponding to the frequency, a picture is created.', default=FREQUENCY)
 
-parameter = vars(parser.parse_args())
-print(parameter)
-
-ALPHA = parameter['a']
-APPROXIMATION = parameter['app']
-BETA = parameter['b']
-DIMENSION = (parameter['d'],parameter['d'])
-FREQUENCY = parameter['f']
-GAMMA = parameter['g']
-KAPPA = parameter['k']
-MU = parameter['m']
-NUMBER = parameter['n']
-RHO = parameter['r']
-SIGMA = parameter['s']
-THETA = parameter['t']
+@dataclass
+class Plate:
+    """
+    The support of the simulation. Each property of the cells is stored in its own array of
+    dimension (row, column), so that the value of a property for the cell at coordinates (y, x) is `plate.<property>[y, x]`
+    
+    :Attributes:
+        - is_in_crystal : (np.ndarray of bool) True if the cell belongs to the crystal, False otherwise
+        - b : (np.ndarray of float32) the proportion of quasi-liquid water
+        - c : (np.ndarray of float32) the proportion of ice
+        - d : (np.ndarray of float32) the proportion of steam
+        - i : (np.ndarray of int32) the iteration at which the cell was attached to the crystal
+    """
+    is_in_crystal: np.ndarray
+    b: np.ndarray
+    c: np.ndarray
+    d: np.ndarray
+    i: np.ndarray
 
 def create_plate(dim=DIMENSION, initial_position=-1):
     """
-    Returns a newly created plate which is a matrix of dictionnaries (a matrix of cells) and places the first crystal cell in it at the inital_pos
-    The keys in a dictionnary represent the properties of the cell
-    
-    :Keys of the dictionnary:
-        - "is_in_crystal" : (bool) True if the cell belongs to the crystal, False otherwise
-        - "b": (float) the proportion of quasi-liquid water
-        - "c" : (float) the proportion of ice
-        - "d" : (float) the proportion of steam
+    Returns a newly created plate (see `Plate`) and places the first crystal cell in it at the inital_pos
     
     :param dim: (tuple) [DEFAULT: DIMENSION] couple of positives integers (row, column), the dimension of the plate
     :param initial_position: (tuple) [DEFAULT: The middle of the plate] the coordinates of the first crystal
-    :return: (list of list of dictionnaries) the plate
+    :return: (Plate) the plate
     
     Exemples:
     
-    >>> DEFAULT_CELL["d"] = 1 # Used in order to not have any problems with doctest
     >>> plate = create_plate(dim=(3,3))
-    >>> for line in plate:
-    ...     print("[", end="")
-    ...     for d in line:
-    ...         print("{", end="")
-    ...         for k in sorted(d.keys()):
-    ...             print(k, ":", d[k], ", ", end="")
-    ...         print("}, ", end="")
-    ...     print("]")
-    [{b : 0 , c : 0 , d : 1 , is_in_crystal : False , }, {b : 0 , c : 0 , d : 1 , is_in_crystal : False , }, {b : 0 , c : 0 , d : 1 , is_in_crystal : False , }, ]
-    [{b : 0 , c : 0 , d : 1 , is_in_crystal : False , }, {b : 0 , c : 1 , d : 0 , i : 0 , is_in_crystal : True , }, {b : 0 , c : 0 , d : 1 , is_in_crystal : False , }, ]
-    [{b : 0 , c : 0 , d : 1 , is_in_crystal : False , }, {b : 0 , c : 0 , d : 1 , is_in_crystal : False , }, {b : 0 , c : 0 , d : 1 , is_in_crystal : False , }, ]
-    >>> DEFAULT_CELL["d"] = RHO # Reverts to original state
-    """
-    plate = [[copy(DEFAULT_CELL) for j in range(dim[1])] for i in range(dim[0])]
+    >>> plate.is_in_crystal
+    array([[False, False, False],
+           [False,  True, False],
+           [False, False, False]])
+    >>> plate.c
+    array([[0., 0., 0.],
+           [0., 1., 0.],
+           [0., 0., 0.]], dtype=float32)
+    >>> plate.d
+    array([[1.1, 1.1, 1.1],
+           [1.1, 0. , 1.1],
+           [1.1, 1.1, 1.1]], dtype=float32)
+    >>> float(plate.b.sum()), int(plate.i.sum())
+    (0.0, 0)
+    >>> plate = create_plate(dim=(3,4), initial_position=(0,3))
+    >>> np.argwhere(plate.is_in_crystal).tolist(), float(plate.c[0, 3]), float(plate.d[0, 3]), int((plate.d == plate.d[0, 0]).sum())
+    ([[0, 3]], 1.0, 0.0, 11)
+    """
+    plate = Plate(is_in_crystal=np.zeros(dim, dtype=np.bool_),
+                  b=np.zeros(dim, dtype=np.float32),
+                  c=np.zeros(dim, dtype=np.float32),
+                  d=np.full(dim, RHO, dtype=np.float32),
+                  i=np.zeros(dim, dtype=np.int32))
     if initial_position == -1:
         initial_position = (dim[0]//2, dim[1]//2)
-    plate[initial_position[0]][initial_position[1]] = {"is_in_crystal":True, "b":0, "c":1, "d":0, "i":0}
+    y, x = initial_position
+    plate.is_in_crystal[y, x] = True
+    plate.c[y, x] = 1
+    plate.d[y, x] = 0
     return plate
 
 def generate_neighbours(coordinates):
@@ -148,283 +163,400 @@ def generate_neighbours(coordinates):
     >>> generate_neighbours((4, 2))
     [(4, 1), (3, 1), (3, 2), (4, 3), (5, 2), (5, 1)]
     """
-    x = coordinates[1]
-    y = coordinates[0]
-    
-    if y % 2 == 0: # If the number of the line is even
-        return [(y, x-1), (y-1, x-1), (y-1, x), (y, x+1), (y+1, x), (y+1, x-1)]
+    y, x = coordinates
+    offsets = OFFSETS_EVEN if y % 2 == 0 else OFFSETS_ODD # The odd lines are shifted by half a cell to the right
+    return [(y + dy, x + dx) for dy, dx in offsets.tolist()]
 
-    else:
-        return [(y, x-1), (y-1, x), (y-1, x+1), (y, x+1), (y+1, x+1), (y+1, x)]
 
-def get_neighbours(coordinates, dim=DIMENSION):
+# Dynamics functions
+@njit(float32(float32[:, ::1], boolean[:, ::1], float32, intp, intp), fastmath=True, cache=True, boundscheck=False)
+def _neighbour_steam(d, is_cry, steam, ny, nx):
     """
-    Returns a list of the coordinates of the neighbours of the cell which `coordinates` are passed as parameter
-    
-    :param coordinates: (tuple)
-    :param dim: (tuple) [DEFAULT: DIMENSION] couple of positives integers (row, column), the dimension of the plate
-    :return: (list of tuples) list of the neighbours coordinates
-    
-    Exemples:
-    >>> get_neighbours((0,0), (5,5))
-    [(0, 1), (1, 0)]
-    >>> get_neighbours((4,0), (5,5))
-    [(3, 0), (4, 1)]
-    >>> get_neighbours((2,4), (5,5))
-    [(2, 3), (1, 3), (1, 4), (3, 4), (3, 3)]
-    >>> get_neighbours((2,2), (5,5))
-    [(2, 1), (1, 1), (1, 2), (2, 3), (3, 2), (3, 1)]
+    Returns the steam that the neighbour at coordinates `ny` `nx` brings to the mean of a cell which has `steam`.
+    If the neighbour is in the crystal, there's no need to add its steam to the mean, therefore, we add the cell's steam.
+    This is computed without a branch, as the border of the crystal makes it unpredictable
+    
+    :param d: (np.ndarray) the steam of the plate
+    :param is_cry: (np.ndarray) True for the cells which are in the crystal
+    :param steam: (float) the steam of the cell
+    :param ny: (int) the y coordinate of the neighbour
+    :param nx: (int) the x coordinate of the neighbour
+    :return: (float) the steam of the neighbour, or `steam` if it is in the crystal
     """
-    # Test if the coordinates are correct, if they are not correct, it removes them from the list
-    list_neighbours = [x for x in generate_neighbours(coordinates) if all(i >= 0 for i in x) and all(i < dim[j] for i in x for j in range(2))]
-    return list_neighbours
+    in_crystal = float32(is_cry[ny, nx])
+    return in_crystal * steam + (1 - in_crystal) * d[ny, nx]
 
-
-# Dynamics functions
-def diffusion_cell(y, x, cell, changes_to_make, plate_in):
+@njit(void(float32[:, ::1], boolean[:, ::1], intp, intp, intp, intp, float32[:, ::1]),
+      parallel=True, fastmath=True, cache=True, boundscheck=False, nogil=True)
+def _diffuse(d, is_cry, y0, y1, x0, x1, out):
     """
-    Adds to the `changes_to_make` dictionnary the changes that will have to be applied to the `cell` at coordinates `y` `x` during the diffusion phase.
-    :param y: (int) the y coordinate of the cell
-    :param x: (int) the x coordinate of the cell
-    :param cell: (dict) A cell
-    :param changes_to_make: (dict) A dictionnary which records all changes that have to be made at the end of the phase
-    :param plate_in: (list(list(dict))) The support of the simulation 
-    :return: (dict) changes_to_make
-    
-    UC : x and y positives and in the dimension
-    Exemple:
-    
-    >>> diffusion_cell(0, 0, little_plate[0][0], {}, little_plate)
-    {(0, 0): 1.1}
-    >>> little_plate[0][0]["d"] = 0.5
-    >>> cell = diffusion_cell(0, 0, little_plate[0][0], {(0, 2): 1.0}, little_plate)
-    >>> cell == {(0, 0): 0.9, (0, 2): 1.0}
-    True
+    Writes in `out` the steam of the cells of the box [y0, y1[ x [x0, x1[ after the diffusion phase.
+    The rows of the box are shared between the available cores, each core computing a block of consecutive rows.
+    A cell inside of the plate always has its 6 neighbours, which are read without checking the bounds of the plate,
+    only the cells on the edges of the plate count their neighbours.
+    
+    :param d: (np.ndarray) the steam of the plate
+    :param is_cry: (np.ndarray) True for the cells which are in the crystal
+    :param y0: (int) the first row of the box
+    :param y1: (int) the row after the last row of the box
+    :param x0: (int) the first column of the box
+    :param x1: (int) the column after the last column of the box
+    :param out: (np.ndarray) the array in which the new steam is written, same shape as `d`
+    :return: None
     """
-    if cell["is_in_crystal"] == False:
-        neighbours = NEIGHBOURS[(y, x)]
-        steam = cell["d"]
-        for (y2,x2) in neighbours:
-            dic = plate_in[y2][x2]
-            # If the neighbour is in the crystal, there's no need to add its steam to the mean, therefore, we add the cell's steam
-            if dic["is_in_crystal"] == True:
-                steam += cell["d"]
+    height, width = d.shape
+    for y in prange(y0, y1):
+        s = y & 1 # The odd rows are shifted by half a cell to the right (see `generate_neighbours`)
+        offsets = OFFSETS_EVEN if s == 0 else OFFSETS_ODD
+        inside_row = 0 < y < height - 1
+        for x in range(x0, x1):
+            steam = d[y, x]
+            if is_cry[y, x]:
+                out[y, x] = steam
+            elif inside_row and 0 < x < width - 1:
+                total = (steam
+                         + _neighbour_steam(d, is_cry, steam, y, x - 1)
+                         + _neighbour_steam(d, is_cry, steam, y - 1, x - 1 + s)
+                         + _neighbour_steam(d, is_cry, steam, y - 1, x + s)
+                         + _neighbour_steam(d, is_cry, steam, y, x + 1)
+                         + _neighbour_steam(d, is_cry, steam, y + 1, x + s)
+                         + _neighbour_steam(d, is_cry, steam, y + 1, x - 1 + s))
+                out[y, x] = total * float32(1 / 7)
             else:
-                steam += dic["d"] # We add the steam of the neighbour to the list of the steams
-        changes_to_make[(y, x)] = steam / (1+len(neighbours))
-        return changes_to_make
-    
-
-def diffusion(plate_in, init_pos, max_point, approximation=0):
+                total = steam
+                count = 1
+                for k in range(6):
+                    ny, nx = y + offsets[k, 0], x + offsets[k, 1]
+                    if 0 <= ny < height and 0 <= nx < width: # A neighbour out of the plate is not counted
+                        count += 1
+                        total += _neighbour_steam(d, is_cry, steam, ny, nx)
+                out[y, x] = total / float32(count)
+
+def diffusion(plate_in, bbox, approximation=0, out=None):
     """
-    Returns the plate passed as a parameter updated by the diffusion phase
-    
-    :param plate: (list(list(dict))) the support of the crystal
-    :param init_pos: (tuple) the coordinates of the first crystal cell
-    :param max_point: (int) the distance between the furthest point from the initial_position and the first cell
-    :param approximation: (int) [DEFAULT:0] the distance from the furthest point of the snowflake beyond which, the diffusion is not calculated
-    :return: (list(list(dict))) the updated crystal
+    Updates the plate passed as a parameter by the diffusion phase
+    The steam of each cell which is not in the crystal becomes the mean of its steam and the steam of its neighbours.
+    A neighbour which is in the crystal counts as the cell itself, and a neighbour out of the plate is not counted.
+    The new steam is computed in `out`, which becomes the steam of the plate, and the previous steam of the plate is returned
+    so that it can be passed as `out` at the next call.
+    
+    :param plate: (Plate) the support of the crystal
+    :param bbox: (tuple) (first row, row after the last row, first column, column after the last column) the box which contains the crystal
+    :param approximation: (int) [DEFAULT:0] the distance from the box of the crystal beyond which, the diffusion is not calculated.
+        If 0, the diffusion is calculated on the whole plate
+    :param out: (np.ndarray) [DEFAULT: None] a buffer of the shape of the plate in which the new steam is computed,
+        which must hold the same steam as the plate out of the box where the diffusion is calculated. A copy of the steam if None
+    :return: (np.ndarray) the previous steam of the plate
 
     Exemple:
     
     >>> test_plate = create_plate(dim=(5,5))
-    >>> test_plate[0][0]["d"] = 10
-    >>> test_plate = diffusion(test_plate, (1,1), 0)
-    >>> test_plate == [[{'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 4.066666666666666}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 2.88}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.1}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.1}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.1}], [{'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 2.583333333333333}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.0999999999999999}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.0999999999999999}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.0999999999999999}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.1}], [{'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.1}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.0999999999999999}, {'is_in_crystal': True, 'b': 0, 'c': 1, 'd': 0, 'i': 0}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.0999999999999999}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.0999999999999999}], [{'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.0999999999999999}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.0999999999999999}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.0999999999999999}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.0999999999999999}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.1}], [{'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.1}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.1}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.1}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.1}, {'is_in_crystal': False, 'b': 0, 'c': 0, 'd': 1.1}]]
-    True
+    >>> test_plate.d[0, 0] = 10
+    >>> previous_steam = diffusion(test_plate, (2, 3, 2, 3))
+    >>> float(previous_steam[0, 0])
+    10.0
+    >>> print(np.round(test_plate.d, 4))
+    [[4.0667 2.88   1.1    1.1    1.1   ]
+     [2.5833 1.1    1.1    1.1    1.1   ]
+     [1.1    1.1    0.     1.1    1.1   ]
+     [1.1    1.1    1.1    1.1    1.1   ]
+     [1.1    1.1    1.1    1.1    1.1   ]]
+    >>> previous_steam = diffusion(test_plate, (2, 3, 2, 3), approximation=1)
+    >>> print(np.round(test_plate.d, 4))
+    [[4.0667 2.88   1.1    1.1    1.1   ]
+     [2.5833 1.5662 1.1    1.1    1.1   ]
+     [1.1    1.3119 0.     1.1    1.1   ]
+     [1.1    1.1    1.1    1.1    1.1   ]
+     [1.1    1.1    1.1    1.1    1.1   ]]
     """
-    changes_to_make = {} # The changes are recorded and applied only when there's no more changes to record
+    height, width = plate_in.d.shape
     if not approximation:
-        for (y,x) in NEIGHBOURS:
-            cell = plate_in[y][x]
-            diffusion_cell(y, x, cell, changes_to_make, plate_in)
+        y0, y1, x0, x1 = 0, height, 0, width
     else:
-        for y in range(max(0, init_pos[0] - approximation - max_point), min(DIMENSION[0], init_pos[0]+approximation + max_point)):
-            for x in range(max(0, init_pos[1] - approximation - max_point), min(DIMENSION[1], init_pos[1] + approximation + max_point)):
-                cell = plate_in[y][x]
-                diffusion_cell(y, x, cell, changes_to_make, plate_in)
-    for coord, value in changes_to_make.items(): 
-        plate_in[coord[0]][coord[1]]["d"] = value
-    return plate_in
-
-def freezing(di, k=KAPPA):
+        y0, y1 = max(0, bbox[0] - approximation), min(height, bbox[1] + approximation)
+        x0, x1 = max(0, bbox[2] - approximation), min(width, bbox[3] + approximation)
+    if out is None:
+        out = plate_in.d.copy()
+    _diffuse(plate_in.d, plate_in.is_in_crystal, y0, y1, x0, x1, out)
+    previous_steam, plate_in.d = plate_in.d, out # The new steam is applied only once every cell has been computed
+    return previous_steam
+
+@njit(void(float32[:, ::1], float32[:, ::1], float32[:, ::1], intp, intp, float32),
+      fastmath=True, cache=True, boundscheck=False)
+def freezing(b, c, d, y, x, k):
     """
-    Returns the cell passed as a parameter updated by the freezing phase.
+    Applies the freezing phase to the cell at coordinates `y` `x`.
     Under the influence of frost from the cristal, each point of the boundary of
     the cristal will get a fraction k of steam converterd into ice, and a
     fraction 1 - k converted into liquid.
     
-    :param di: (dict) The cell on which we apply the freezing phase.
-    :param k: (float) [DEFAULT: KAPPA] The fraction used fo the evolution of the snowflake.
-    :return: (dict) The updated cell.
+    :param b: (np.ndarray) the quasi-liquid water of the plate
+    :param c: (np.ndarray) the ice of the plate
+    :param d: (np.ndarray) the steam of the plate
+    :param y: (int) the y coordinate of the cell on which we apply the freezing phase.
+    :param x: (int) the x coordinate of the cell on which we apply the freezing phase.
+    :param k: (float) The fraction used fo the evolution of the snowflake.
+    :return: None
     
     UC: A valid plate, 0 <= k <= 1
     Exemple:
     
-    >>> test = freezing(little_plate[1][1])
-    >>> test == {'b': 0.44000000000000006, 'is_in_crystal': False, 'd': 0, 'c': 0.66}
-    True
+    >>> freezing(little_plate.b, little_plate.c, little_plate.d, 1, 1, KAPPA)
+    >>> round(float(little_plate.b[1, 1]), 4), round(float(little_plate.c[1, 1]), 4), float(little_plate.d[1, 1])
+    (0.44, 0.66, 0.0)
     """ 
-    di["b"] = di["b"] + (1 - k) * di["d"]
-    di["c"] = di["c"] + k * di["d"]
-    di["d"] = 0
-    return di
+    b[y, x] = b[y, x] + (1 - k) * d[y, x]
+    c[y, x] = c[y, x] + k * d[y, x]
+    d[y, x] = 0
 
 
-def attachment(di, cell_at_border, neighbours, ind, alpha=ALPHA, beta=BETA, theta=THETA):
+@njit(boolean(float32[:, ::1], float32[:, ::1], boolean[:, ::1], intp, intp, float32, float32, float32),
+      fastmath=True, cache=True, boundscheck=False)
+def attachment(b, d, is_cry, y, x, alpha, beta, theta):
     """
-    Returns the cell passed as a parameter updated (or not) by the freezing phase
-    
-    :param di: (dict) the cell on which the attachment phase is applied
-    :param cell_at_border: (tuple(int, int) the coordinates of the cell on which the attachment phase is applied
-    :neighbours: (dict) the neighbours of the cell. key: the coordinates of the neighbour, value: the information of the neighbouring cell
-    :param new_cells_at_border: (set) the set of all new cells which are on the border
-    :param ind: (int) the number of updated we've done to the plate so far
-    :param alpha: (float) [DEFAULT: ALPHA] Coefficient that determine the minimum amount of ice in a cell for it
+    Returns True if the cell at coordinates `y` `x` attaches itself to the crystal during the attachment phase, False otherwise
+    
+    :param b: (np.ndarray) the quasi-liquid water of the plate
+    :param d: (np.ndarray) the steam of the plate
+    :param is_cry: (np.ndarray) True for the cells which are in the crystal
+    :param y: (int) the y coordinate of the cell on which the attachment phase is applied
+    :param x: (int) the x coordinate of the cell on which the attachment phase is applied
+    :param alpha: (float) Coefficient that determine the minimum amount of ice in a cell for it
         to attach itself to the cristal if it only has 3 cristal cells in the neighbourhood. Works with theta.
-    :param beta: (float) [DEFAULT: BETA] Coefficient that determine the minimum amount of ice in a cell for it
+    :param beta: (float) Coefficient that determine the minimum amount of ice in a cell for it
         to attach itself to the cristal if it only has 1 or 2 cristal cells in the neighbourhood.
-    :param theta: (float) [DEFAULT: THETA] Coefficient that determine the maximum amount of vapor surrounding
+    :param theta: (float) Coefficient that determine the maximum amount of vapor surrounding
         the cell for it to still turn into a part of the cristal. With alpha, if both condition are True then
         the cell will be part of the cristal if it is surrrounded by 3 cristal cells.
-    :return: (dict) the dictionnary is either the updated cell, either None if the cell was not updated.
+    :return: (bool) True if the cell has to be attached to the crystal, False otherwise.
+    
+    Exemple:
+    
+    >>> test_plate = create_plate(dim=(5,5))
+    >>> test_plate.b[2, 3] = 0.7
+    >>> attachment(test_plate.b, test_plate.d, test_plate.is_in_crystal, 2, 3, ALPHA, BETA, THETA)
+    True
+    >>> attachment(test_plate.b, test_plate.d, test_plate.is_in_crystal, 2, 1, ALPHA, BETA, THETA)
+    False
     """
-    x, y = cell_at_border[1], cell_at_border[0]
+    height, width = d.shape
     
     cristal_neighbours = 0
-    test_with_theta = 0
-    for neigh_coord, neigh_di in neighbours.items():
-        if neigh_di["is_in_crystal"] == True:
-            cristal_neighbours += 1     
-        test_with_theta += neigh_di["d"]
-            
-    if (((cristal_neighbours in (1, 2)) and (di["b"] > beta))
-        or ((cristal_neighbours == 3) and ((di["b"] >= 1) or ((test_with_theta < theta) and (di["b"] >= alpha))))
-        or cristal_neighbours > 3): # We attach the cell to the crystal
-        di_out = deepcopy(di)
-        di_out["c"] = di["c"] + di["b"]
-        di_out["b"] = 0
-        di_out["d"] = 0
-        di_out["is_in_crystal"] = True
-        di_out["i"] = ind
-        return di_out
-    else:
-        return None
+    test_with_theta = float32(0)
+    offsets = OFFSETS_EVEN if (y & 1) == 0 else OFFSETS_ODD
+    for k in range(6):
+        y2, x2 = y + offsets[k, 0], x + offsets[k, 1]
+        if 0 <= y2 < height and 0 <= x2 < width:
+            if is_cry[y2, x2]:
+                cristal_neighbours += 1     
+            test_with_theta += d[y2, x2]
+    
+    return (((1 <= cristal_neighbours <= 2) and (b[y, x] > beta))
+            or ((cristal_neighbours == 3) and ((b[y, x] >= 1) or ((test_with_theta < theta) and (b[y, x] >= alpha))))
+            or cristal_neighbours > 3)
             
-def melting(di, mu=MU, gamma=GAMMA):
+@njit(void(float32[:, ::1], float32[:, ::1], float32[:, ::1], intp, intp, float32, float32),
+      fastmath=True, cache=True, boundscheck=False)
+def melting(b, c, d, y, x, mu, gamma):
     """
-    Does the melting phase for one cell and returns it.
-    
-    :param di: (dict) the cell on which the melting is applied
-    :param mu: (float) [DEFAULT: MU] proportion of water that transforms into steam 
-    :param gamma: (float) [DEFAULT: GAMMA] proportion of ice that transforms into steam
-    :return: (dict) the updated cell
+    Applies the melting phase to the cell at coordinates `y` `x`.
+    
+    :param b: (np.ndarray) the quasi-liquid water of the plate
+    :param c: (np.ndarray) the ice of the plate
+    :param d: (np.ndarray) the steam of the plate
+    :param y: (int) the y coordinate of the cell on which the melting is applied
+    :param x: (int) the x coordinate of the cell on which the melting is applied
+    :param mu: (float) proportion of water that transforms into steam 
+    :param gamma: (float) proportion of ice that transforms into steam
+    :return: None
     
     Exemple:
     
-    >>> test = melting(little_plate[1][1])
-    >>> test == {'is_in_crystal': False, 'd': 0.55, 'b': 0.22000000000000003, 'c': 0.33}
-    True
+    >>> melting(little_plate.b, little_plate.c, little_plate.d, 1, 1, MU, GAMMA)
+    >>> round(float(little_plate.b[1, 1]), 4), round(float(little_plate.c[1, 1]), 4), round(float(little_plate.d[1, 1]), 4)
+    (0.22, 0.33, 0.55)
     """
-    di["d"] = di["d"] + mu * di["b"] + gamma * di["c"]
-    di["b"] = (1-mu) * di["b"]
-    di["c"] = (1-gamma) * di["c"]
-    return di
+    d[y, x] = d[y, x] + mu * b[y, x] + gamma * c[y, x]
+    b[y, x] = (1-mu) * b[y, x]
+    c[y, x] = (1-gamma) * c[y, x]
+
+@njit(void(int32[:, ::1], float32[:, ::1], float32[:, ::1], float32[:, ::1], boolean[:, ::1], int32[:, ::1], intp,
+           float32, float32, float32, float32, float32, float32, boolean[::1]),
+      fastmath=True, cache=True, boundscheck=False, nogil=True)
+def _step_border(border, b, c, d, is_cry, i_arr, ind, alpha, beta, theta, kappa, mu, gamma, attached_out):
+    """
+    Applies the freezing, attachment and melting phases to each cell at the border, in the order of `border`,
+    then attaches to the crystal the cells which have to be.
+    The cells are attached only once every cell at the border has been treated, so that they do not
+    count as cristal neighbours during this iteration.
+    
+    :param border: (np.ndarray) the coordinates (y, x) of the cells at the border, of shape (number of cells, 2)
+    :param b: (np.ndarray) the quasi-liquid water of the plate
+    :param c: (np.ndarray) the ice of the plate
+    :param d: (np.ndarray) the steam of the plate
+    :param is_cry: (np.ndarray) True for the cells which are in the crystal
+    :param i_arr: (np.ndarray) the iteration at which the cells were attached to the crystal
+    :param ind: (int) the number of updates we've done to the plate so far
+    :param alpha, beta, theta: (float) the coefficients of the attachment phase (see `attachment`)
+    :param kappa: (float) the coefficient of the freezing phase (see `freezing`)
+    :param mu, gamma: (float) the coefficients of the melting phase (see `melting`)
+    :param attached_out: (np.ndarray) of bool, of the length of `border`, set to True for the cells which were attached
+    :return: None
+    """
+    for n in range(border.shape[0]):
+        y, x = border[n, 0], border[n, 1]
+        freezing(b, c, d, y, x, kappa)
+        attached_out[n] = attachment(b, d, is_cry, y, x, alpha, beta, theta)
+        if attached_out[n]:
+            # Only the steam of the cell is read by the others, its water and ice are kept for the attachment
+            d[y, x] = d[y, x] + mu * b[y, x] + gamma * c[y, x]
+        else:
+            melting(b, c, d, y, x, mu, gamma)
+    
+    for n in range(border.shape[0]): # We apply the changes done at the attachment phase
+        if attached_out[n]:
+            y, x = border[n, 0], border[n, 1]
+            is_cry[y, x] = True
+            c[y, x] = c[y, x] + b[y, x]
+            b[y, x] = 0
+            d[y, x] = 0
+            i_arr[y, x] = ind
 
 def interference(plate, sigma=SIGMA):
     """
     Introduces randomness into the simulation by altering by a little the quantity of steam into each cell of the plate. Has a board effect on plate
     
-    :param plate: (list(list(dict))) the support of the crystal
+    :param plate: (Plate) the support of the crystal
     :param sigma: (float) [DEFAULT:SIGMA] the coefficient which determines the amplitude of the randomness
     :return: None
     
     UC: 0 <= sigma << 1
+    Exemple:
+    
+    >>> test_plate = create_plate(dim=(5,5))
+    >>> interference(test_plate, sigma=0.1)
+    >>> float(test_plate.d[2, 2]), bool(np.all(np.abs(test_plate.d[~test_plate.is_in_crystal] - 1.1) <= 1.1 * 0.05 + 1e-6))
+    (0.0, True)
     """
-    for (y,x) in NEIGHBOURS:
-        cell = plate[y][x]
-        if cell["is_in_crystal"] == False:
-            cell["d"] = cell["d"] * (1 + (random.random()- 0.5) * sigma)
+    if not sigma:
+        return None
+    noise = _RNG.random(plate.d.shape, dtype=np.float32) - np.float32(0.5)
+    plate.d *= 1 + sigma * noise * ~plate.is_in_crystal
     return None
 
-def is_border_correct(plate, cells_at_border):
+def is_border_correct(plate, border_mask):
     """
     Checks if border is correct
+    Only meant for debugging: it is called in an assertion, which is removed when Python runs with -O
     
-    :param plate: (dict) the support of the simulation
-    :param cells_at_border: (set) the coordinates of the cells at the border
+    :param plate: (Plate) the support of the simulation
+    :param border_mask: (np.ndarray) of bool, True for the cells at the border
     :return: (bool) True if it is correct, False otherwise
     
     Exemple: 
     
-    >>> is_border_correct(little_plate, {(0,0)})
+    >>> mask = np.zeros((5, 5), dtype=np.bool_)
+    >>> mask[0, 0] = True
+    >>> is_border_correct(little_plate, mask)
     False
-    >>> is_border_correct(little_plate, {(2, 1), (1, 1), (1, 2), (2, 3), (3, 2), (3, 1)})
+    >>> mask[0, 0] = False
+    >>> mask[[2, 1, 1, 2, 3, 3], [1, 1, 2, 3, 2, 1]] = True
+    >>> is_border_correct(little_plate, mask)
     True
     """
-    for (y,x) in NEIGHBOURS:
-        cell_di = plate[y][x]
-        neighbours = {} # A dictionnary of all neighbours key: coordinates value: dictionnary
-        for y2, x2 in NEIGHBOURS[(y, x)]:
-            neighbours[(y2,x2)] = plate[y2][x2]
-            
-        if (y, x) in cells_at_border:
-            has_neighbour = False
-            for neigh_coord, neigh_di in neighbours.items():
-                if neigh_di["is_in_crystal"] == True:
-                    has_neighbour = True
-                    break
-            if not has_neighbour:
-                return False
-        
-        elif cell_di["is_in_crystal"] == True:
-            if (y,x) in cells_at_border:
-                return False
-        
-        else:
-            has_neighbour = False
-            for neigh_coord, neigh_di in neighbours.items():
-                if neigh_di["is_in_crystal"] == True:
-                    has_neighbour = True
-                    break
-            if has_neighbour:
-                return False
-    return True
-  
+    # The cells at the border are the cells which are not in the crystal but have a neighbour in it
+    height, width = plate.d.shape
+    cryst_padded = np.pad(plate.is_in_crystal, 1)
+    even_rows = (np.arange(height)[:, None] % 2) == 0
+    has_neighbour = np.zeros((height, width), dtype=np.bool_)
+    for (dy_even, dx_even), (dy_odd, dx_odd) in zip(OFFSETS_EVEN.tolist(), OFFSETS_ODD.tolist()):
+        has_neighbour |= np.where(even_rows,
+                                  cryst_padded[1+dy_even:1+dy_even+height, 1+dx_even:1+dx_even+width],
+                                  cryst_padded[1+dy_odd:1+dy_odd+height, 1+dx_odd:1+dx_odd+width])
+    return bool(np.array_equal(border_mask, has_neighbour & ~plate.is_in_crystal))
+
+def update_border(border_mask, is_cry, attached):
+    """
+    Updates the mask of the cells at the border once the cells at coordinates `attached` have been attached to the crystal:
+    they leave the border, and their neighbours which are not in the crystal join it.
+    
+    :param border_mask: (np.ndarray) of bool, True for the cells at the border
+    :param is_cry: (np.ndarray) True for the cells which are in the crystal
+    :param attached: (np.ndarray) the coordinates (y, x) of the newly attached cells, of shape (number of cells, 2)
+    :return: None
+    
+    Exemple:
+    
+    >>> mask = np.zeros((5, 5), dtype=np.bool_)
+    >>> update_border(mask, little_plate.is_in_crystal, np.array([(2, 2)]))
+    >>> is_border_correct(little_plate, mask)
+    True
+    >>> mask.astype(int)
+    array([[0, 0, 0, 0, 0],
+           [0, 1, 1, 0, 0],
+           [0, 1, 0, 1, 0],
+           [0, 1, 1, 0, 0],
+           [0, 0, 0, 0, 0]])
+    >>> mask = np.zeros((5, 5), dtype=np.bool_)
+    >>> update_border(mask, little_plate.is_in_crystal, np.array([(0, 0), (4, 4)])) # The neighbours out of the plate are ignored
+    >>> [tuple(coord) for coord in np.argwhere(mask).tolist()]
+    [(0, 1), (1, 0), (3, 3), (3, 4), (4, 3)]
+    """
+    offsets = np.where((attached[:, 0] & 1)[:, None, None] == 0, OFFSETS_EVEN, OFFSETS_ODD)
+    neighbours = (attached[:, None, :] + offsets).reshape(-1, 2)
+    neighbours = neighbours[(neighbours >= 0).all(axis=1) & (neighbours < is_cry.shape).all(axis=1)]
+    neighbours = neighbours[~is_cry[neighbours[:, 0], neighbours[:, 1]]]
+    border_mask[neighbours[:, 0], neighbours[:, 1]] = True
+    border_mask[attached[:, 0], attached[:, 1]] = False
+
 def savestates(plate, filename, n, newpath, number=NUMBER):
     """
     Create a JPEG and a PNG of the snowflake.
+    The colours of the cells are computed right away, and the pictures are drawn and saved in the background,
+    so that the simulation can go on in the meantime.
     
-    :param plate: (list of list of dict) The plate which contain the cristal.
+    :param plate: (Plate) The plate which contain the cristal.
     :param filename: (str) Name of the file.
     :param n: (int) The n-th iteration of the snowflake.
         0 by default, if the param doesn't change you will only get the last image.
     :param newpath: (str) the path of the folder where the pictures are saved
     :param number: (int) [DEFAULT:NUMBER] the total number of iterations
+    :return: (concurrent.futures.Future) the future of the saving of the pictures
     """
-    pixels_snowflake = []
     index_number = str(n).zfill(len(str(number))) # Adds leading zeros in front of the index (instead of 50 we would get 050)
     
+    # The cells of the crystal are green, with more blue the later they were attached, the other cells are bluer the less steam they have
+    rgb = np.zeros(plate.d.shape + (3,), dtype=np.uint8)
+    rgb[..., 1] = np.where(plate.is_in_crystal, 255, 0)
+    rgb[..., 2] = np.clip(np.where(plate.is_in_crystal,
+                                   (plate.i / number * 255).astype(np.int32),
+                                   255 - (plate.d / RHO * 255).astype(np.int32)), 0, 255)
+    return _IMG_POOL.submit(_save_pictures, rgb,
+                            newpath + "Pixels/" + filename + index_number + ".png",
+                            newpath + "Hexagons/" + filename + index_number + ".jpeg")
+
+def _save_pictures(rgb, pixel_path, hexagon_path):
+    """
+    Saves the pixel image and the hexagon image of a plate.
+    
+    :param rgb: (np.ndarray) the colour of each cell of the plate, of shape (row, column, 3)
+    :param pixel_path: (str) the path of the PNG in which a cell is a pixel
+    :param hexagon_path: (str) the path of the JPEG in which a cell is an hexagon
+    :return: None
+    """
     # Creating the pixel image
-    for y in range(DIMENSION[0]):
-        for x in range(DIMENSION[1]):
-            d = plate[y][x]
-            if d["is_in_crystal"] == False:
-                pixels_snowflake.append((0,0,255 - int((d["d"] / RHO)*255)))
-            else:
-                pixels_snowflake.append((0,255,(int(d["i"]/NUMBER*255))))
-    snowflake = Image.new("RGB", DIMENSION, color=0)
-    snowflake.putdata(pixels_snowflake)
-    snowflake.save(newpath + "Pixels/" + filename + index_number + ".png", format="PNG")
+    snowflake = Image.fromarray(rgb, "RGB")
+    snowflake.save(pixel_path, format="PNG")
     
     
     # Creating the Hexagon Image
     # Half the height of the hexagon
-    x = 12*DIMENSION[1]+6
-    y = DIMENSION[0]*11+3
+    height, width = rgb.shape[:2]
+    x = 12*width+6
+    y = height*11+3
     snowflake = Image.new("RGB", (x, y), color=0)
-    for y in range(DIMENSION[0]):
-        for x in range(DIMENSION[1]):
+    for y in range(height):
+        for x in range(width):
             
             # Add the horizontal offset on every other row
             x_ = 0 if (y % 2 == 0) else 6
@@ -438,13 +570,9 @@ def savestates(plate, filename, n, newpath, number=NUMBER):
                 (12*x     +x_, y*10 +3 )
             ]
             
-            d = plate[y][x]
-            if d["is_in_crystal"] == False:
-                ImageDraw.Draw(snowflake).polygon(xy=shape, fill=(0,0,255 - int((d["d"] / RHO)*255)), outline=(0,0,255 - int((d["d"] / RHO)*255)), )
-            else:
-                ImageDraw.Draw(snowflake).polygon(xy=shape, fill=(0,255,(int(d["i"]/NUMBER*255))), outline=(0,255,(int(d["i"]/NUMBER*255))))
-    snowflake.save(newpath + "Hexagons/" + filename + index_number + ".jpeg", format="JPEG")
-    return
+            colour = tuple(rgb[y, x].tolist()) # Same colour as the pixel image
+            ImageDraw.Draw(snowflake).polygon(xy=shape, fill=colour, outline=colour)
+    snowflake.save(hexagon_path, format="JPEG")
   
 def create_gif(path):
     """
@@ -489,10 +617,10 @@ def model_snowflake(number=NUMBER, dim=DIMENSION, init_pos=-1,
     :return: None
     """
     print("Creating plate...")
-    plate = create_plate(initial_position = init_pos)
+    plate = create_plate(dim=dim, initial_position=init_pos)
     print("Plate successfully created !")
     
-    newpath = "./a-{alpha} b-{beta} t-{theta} m-{mu} g-{gamma} k-{kappa} r-{rho} approx-{approx}/".format(beta=BETA, alpha=ALPHA, theta=THETA, mu=MU, gamma=GAMMA, kappa=KAPPA, rho=RHO, approx=APPROXIMATION)
+    newpath = "./a-{alpha!s} b-{beta!s} t-{theta!s} m-{mu!s} g-{gamma!s} k-{kappa!s} r-{rho!s} approx-{approx}/".format(beta=beta, alpha=alpha, theta=theta, mu=mu, gamma=gamma, kappa=kappa, rho=RHO, approx=APPROXIMATION)
     print(newpath)
     
     # Creates directories if they do not exist    
@@ -504,11 +632,17 @@ def model_snowflake(number=NUMBER, dim=DIMENSION, init_pos=-1,
         os.makedirs(newpath + "/Hexagons")
 
 
-    if init_pos == -1: # Initialises the `cells_at_border` set
+    if init_pos == -1: # Initialises the border
         init_pos = (dim[0]//2, dim[1]//2)
-    cells_at_border = set(NEIGHBOURS[(init_pos[0], init_pos[1])]) # set of tuples of coordinates
+    border_mask = np.zeros(plate.d.shape, dtype=np.bool_) # True for the cells at the border
+    update_border(border_mask, plate.is_in_crystal, np.array([init_pos], dtype=np.int32))
     max_point = 0
+    bbox = [init_pos[0], init_pos[0] + 1, init_pos[1], init_pos[1] + 1] # The box which contains the crystal
     len_total = len(str(number))
+    # The diffusion phase is computed alternately in this buffer and in the steam of the plate.
+    # As the box where it is calculated contains the border, both buffers only differ inside of it
+    d_buffer = plate.d.copy()
+    saves = [] # The futures of the pictures being saved
     
     # Runs the simulation `number` times
     print("Running simulation...")
@@ -516,50 +650,35 @@ def model_snowflake(number=NUMBER, dim=DIMENSION, init_pos=-1,
     print("- - - - - - - - - - - - - - -")
     for i in range(number):
         #DIFFUSION
-        plate = diffusion(plate, init_pos, max_point, approximation=APPROXIMATION)
+        d_buffer = diffusion(plate, bbox, approximation=APPROXIMATION, out=d_buffer)
 
-        changes_to_make = {}
-        for cell in cells_at_border: # `cell` is a tuple of coordinates
-            cell_di = plate[cell[0]][cell[1]] # `cell_di` is a dictionnary
-            
-            # FREEZING
-            cell_di = freezing(cell_di)
-            
-            # ATTACHMENT
-            neighbours = {} # A dictionnary of all neighbours key: coordinates value: dictionnary
-            for y, x in NEIGHBOURS[(cell[0], cell[1])]:
-                neighbours[(y,x)] = plate[y][x]
-            new_cell = attachment(cell_di, cell, neighbours, i)
-            if new_cell: # If not None in this case
-                changes_to_make[(cell[0], cell[1])] = new_cell
-            
-            # MELTING
-            cell_di = melting(cell_di)
+        # FREEZING, ATTACHMENT AND MELTING
+        border = np.ascontiguousarray(np.argwhere(border_mask), dtype=np.int32) # The coordinates of the cells at the border
+        attached = np.zeros(len(border), dtype=np.bool_)
+        _step_border(border, plate.b, plate.c, plate.d, plate.is_in_crystal, plate.i, i,
+                     alpha, beta, theta, kappa, mu, gamma, attached)
             
         # INTERFERENCE
         if sigma:
-            interference(plate)
+            interference(plate, sigma)
+            d_buffer[...] = plate.d # The interference changes the whole plate
         
-        for coord, di in changes_to_make.items(): 
-            plate[coord[0]][coord[1]] = di # We apply the changes done at the attachment phase
-            max_point = max(abs(init_pos[0] - coord[0]), abs(init_pos[1] - coord[1]), max_point)
-            # We update the cells at the border
-            neighbours = {}
-            for y, x in NEIGHBOURS[(coord[0], coord[1])]: # All the neighbours of the cell we changed
-                neighbours[(y,x)] = plate[y][x] # We create a dictionnary of the neighbours
-            
-            for neigh_coord, di in neighbours.items():
-                if (di["is_in_crystal"] == False 
-                    and (not neigh_coord in changes_to_make)):
-                    cells_at_border.add(neigh_coord) # We add the new cells at the border
-            cells_at_border.remove(coord) # We remove the old cell at the border
+        attached_coords = border[attached] # The cells which were attached to the crystal
+        if len(attached_coords):
+            max_point = max(int(np.abs(attached_coords - np.array(init_pos)).max()), max_point)
+            bbox = [min(bbox[0], int(attached_coords[:, 0].min())), max(bbox[1], int(attached_coords[:, 0].max()) + 1),
+                    min(bbox[2], int(attached_coords[:, 1].min())), max(bbox[3], int(attached_coords[:, 1].max()) + 1)]
+            update_border(border_mask, plate.is_in_crystal, attached_coords)
         
         
         # Saves the state of the plate
         if i % frequency == 0:
-            savestates(plate, "snowflake", i, newpath)
+            assert is_border_correct(plate, border_mask)
+            saves.append(savestates(plate, "snowflake", i, newpath, number))
             print("{frames:{longueur}d} / {total} |   {distance}".format(longueur = len_total + 2, frames=i, total=number, distance=max_point))
-    savestates(plate, "snowflake", i, newpath)
+    saves.append(savestates(plate, "snowflake", i, newpath, number))
+    for save in saves: # Waits for all the pictures to be saved
+        save.result()
     print("Simulation done !")
     print("Creating gif...")
     create_gif(newpath) # Creates a gif from all the pictures saved from the plate
@@ -567,15 +686,27 @@ def model_snowflake(number=NUMBER, dim=DIMENSION, init_pos=-1,
     return
 
 
-# Create a dictionnary which maps a list of neighbours coordinates to the coordinates of a cell
-# To access the neughbours of a cell which coordinates are (a, b) you do NEIGHBOURS[(a, b)]
-NEIGHBOURS = {}
-for i in range(DIMENSION[0]):
-    for j in range(DIMENSION[1]):
-        NEIGHBOURS[(i,j)] = get_neighbours((i,j))
-
 if __name__ == '__main__':
-    model_snowflake() # Runs the simulation
+    parameter = vars(parser.parse_args())
+    print(parameter)
+    
+    # The coefficients are single precision floats, like the plate
+    ALPHA = np.float32(parameter['a'])
+    APPROXIMATION = parameter['app']
+    BETA = np.float32(parameter['b'])
+    DIMENSION = (parameter['d'],parameter['d'])
+    FREQUENCY = parameter['f']
+    GAMMA = np.float32(parameter['g'])
+    KAPPA = np.float32(parameter['k'])
+    MU = np.float32(parameter['m'])
+    NUMBER = parameter['n']
+    RHO = np.float32(parameter['r'])
+    SIGMA = np.float32(parameter['s'])
+    THETA = np.float32(parameter['t'])
+    
+    # Runs the simulation
+    model_snowflake(number=NUMBER, dim=DIMENSION, alpha=ALPHA, beta=BETA, theta=THETA,
+                    mu=MU, gamma=GAMMA, kappa=KAPPA, sigma=SIGMA, frequency=FREQUENCY)
     
     # SETUP FOR THE DOCTEST
     ALPHA = 0.7
@@ -592,12 +723,7 @@ if __name__ == '__main__':
     # 20 : Little loss on the branches on 400*400
     APPROXIMATION = 40
     SIGMA = 0.000 # Coefficient for the interference
-    DEFAULT_CELL = {"is_in_crystal":False, "b":0, "c":0, "d":RHO}
     little_plate = create_plate(dim=(5,5))
-    NEIGHBOURS = {}
-    for i in range(5):
-        for j in range(5):
-            NEIGHBOURS[(i,j)] = get_neighbours((i,j), dim=(5,5))    
 
     import doctest
     doctest.testmod()